@@ -1,5 +1,6 @@
 """
 """
+import functools
 
 from cronometer.core.errors import MessageError
 from cronometer.datasource import crdbFoods
@@ -24,17 +25,24 @@ class _FoodSourceWrapper(object):
         Create a new wrapper
         """
         self.__source = source
-        if source == FoodSource.USER:
-            self.__proxies = userFoods.getUserProxies(toolbox.getUserAppDirectory())
-        elif source == FoodSource.CRDB:
-            self.__proxies = crdbFoods.getCRDBProxies()
-        elif source == FoodSource.DEPRECATED:
-            self.__proxies = usdaFoods.getDeprecatedProxies()
-        else:
-            self.__proxies = usdaFoods.getUsdaProxies(source)
-
         self.__foods = dict[int, Food]()
 
+    @functools.cached_property
+    def proxies(self) -> list[FoodProxy]:
+        """
+        The proxies for all the foods in the source.
+
+        The index is only read the first time this is used, so adding a
+        source does not have to wait on it.
+        """
+        if self.__source is FoodSource.USER:
+            return userFoods.getUserProxies(toolbox.getUserAppDirectory())
+        elif self.__source is FoodSource.CRDB:
+            return crdbFoods.getCRDBProxies()
+        elif self.__source is FoodSource.DEPRECATED:
+            return usdaFoods.getDeprecatedProxies()
+        return usdaFoods.getUsdaProxies(self.__source)
+
     def getFood(self, index: int) -> Food:
         """
         Get the food with the given index.
@@ -42,10 +50,10 @@ class _FoodSourceWrapper(object):
         if index in self.__foods:
             return self.__foods[index]
 
-        if self.__source == FoodSource.USER:
+        if self.__source is FoodSource.USER:
             # TODO need to update UserFood to be a Food type.
             food = userFoods.loadUserFood(toolbox.getUserAppDirectory(), index)
-        elif self.__source == FoodSource.CRDB:
+        elif self.__source is FoodSource.CRDB:
             food = crdbFoods.loadCRDBFood(index)
         else:
             food = usdaFoods.loadUsdaFood(self.__source, index)
@@ -7,23 +7,44 @@ This lovely data source also includes recipes, so it has some extra
 spicy handling necessary.
 """
 import os
-import zipfile
 
 from typing import Union
 
 from pydantic_core import from_json
 
 from cronometer import DATA_DIR
+from cronometer.datasource.userFoods import EntryType
+from cronometer.datasource.userFoods import RecipeServing
 from cronometer.datasource.userFoods import UserFood
 from cronometer.datasource.userFoods import UserRecipe
 from cronometer.foods.food import FoodProxy
 from cronometer.foods.food import FoodSource
+from cronometer.foods.food import constructFoodFields
 
+from .helpers import openZip
 from .helpers import readIndex
 
 CRDB_ZIP = os.path.join(DATA_DIR, "crdb_005.zip")
 
 
+def _constructFood(data: dict) -> Union[UserFood, UserRecipe]:
+    """
+    Build a food or recipe from its json data without running pydantic
+    validation.
+
+    The crdb data ships with cronometer so it is already known to be
+    valid.
+    """
+    fields = constructFoodFields(data)
+    if data.get("entryType") == EntryType.RECIPE.value:
+        servings = [RecipeServing.model_construct(**s)
+                    for s in data["servings"]]
+        return UserRecipe.model_construct(entryType=EntryType.RECIPE,
+                                          servings=servings,
+                                          **fields)
+    return UserFood.model_construct(entryType=EntryType.FOOD, **fields)
+
+
 def _getFoodFromZip(foodId: str) -> Union[UserFood, UserRecipe]:
     """
     Load a food or recipe from the crdb zip file using the given id.
@@ -31,13 +52,7 @@ def _getFoodFromZip(foodId: str) -> Union[UserFood, UserRecipe]:
     The id string should contain any sort of padding that is needed
     """
     foodPath = f"{foodId}.json"
-    with zipfile.ZipFile(CRDB_ZIP, "r") as archive:
-        with archive.open(foodPath, "r") as f:
-            data = from_json(f.read())
-            if data.get("entryType") == "recipe":
-                return UserRecipe.model_validate(data)
-            else:
-                return UserFood.model_validate(data)
+    return _constructFood(from_json(openZip(CRDB_ZIP).read(foodPath)))
 
 
 def getCRDBProxies() -> list[FoodProxy]:
@@ -1,5 +1,11 @@
 
+import atexit
+import mmap
+import os
 import re
+import struct
+import zipfile
+import zlib
 
 from pathlib import Path
 from typing import Union
@@ -7,24 +13,122 @@ from typing import Union
 from cronometer.foods.food import FoodProxy
 from cronometer.foods.food import FoodSource
 
-INDEX_PAT = re.compile(r"(?:(\d+)\|\|\|)?(\d+)\|(.*)")
+INDEX_PAT = re.compile(r"^(?:(\d+)\|\|\|)?(\d+)\|(.*)$", re.MULTILINE)
+
+# The fixed size part of a zip local file header, and the offset of the
+# filename and extra field lengths within it.
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_LENGTHS = struct.Struct("<HH")
+_LOCAL_LENGTHS_OFFSET = 26
+
+
+class _ZipReader(object):
+    """
+    A read only view of a zip file that is memory mapped.
+
+    Where each entry's data starts is worked out the first time the
+    entry is read. After that, deflated and stored entries are sliced
+    straight out of the mapping without going through zipfile's
+    stream objects. Entries using any other compression fall back to
+    the ZipFile.
+    """
+    def __init__(self, path: str):
+        """
+        Open the zip at path.
+        """
+        self.__zip = zipfile.ZipFile(path, "r")
+        with open(path, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__entries = dict[str, tuple[int, int, int, int]]()
+
+    def __entry(self, name: str) -> tuple[int, int, int, int]:
+        """
+        Get the data offset, compressed size, size and compression
+        method for the entry with the given name.
+        """
+        entry = self.__entries.get(name)
+        if entry is None:
+            info = self.__zip.getinfo(name)
+            # The local header can have a different extra field than the
+            # central directory, so its lengths are read from the file.
+            nameLen, extraLen = _LOCAL_LENGTHS.unpack_from(
+                self.__map, info.header_offset + _LOCAL_LENGTHS_OFFSET)
+            offset = info.header_offset + _LOCAL_HEADER_SIZE + nameLen + extraLen
+            entry = (offset, info.compress_size, info.file_size,
+                     info.compress_type)
+            self.__entries[name] = entry
+        return entry
+
+    def read(self, name: str) -> bytes:
+        """
+        Read the uncompressed data for the named entry.
+        """
+        offset, compressSize, size, method = self.__entry(name)
+        if method == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(self.__map[offset:offset + compressSize],
+                                   -zlib.MAX_WBITS, size or zlib.DEF_BUF_SIZE)
+        if method == zipfile.ZIP_STORED:
+            return self.__map[offset:offset + size]
+        return self.__zip.read(name)
+
+    def close(self):
+        """
+        Close the mapping and the underlying ZipFile.
+        """
+        self.__map.close()
+        self.__zip.close()
+
+
+_zipFiles = dict[str, _ZipReader]()
+
+
+def openZip(path: Union[str, Path]) -> _ZipReader:
+    """
+    Get a read only reader for the zip file at the given path.
+
+    Readers are kept open and shared between callers so that the zip
+    directory is only read once per file. Call closeZip before the file
+    is rewritten.
+    """
+    key = os.fspath(path)
+    archive = _zipFiles.get(key)
+    if archive is None:
+        archive = _ZipReader(key)
+        _zipFiles[key] = archive
+    return archive
+
+
+def closeZip(path: Union[str, Path]):
+    """
+    Close the shared reader for the given path, if it is open.
+    """
+    archive = _zipFiles.pop(os.fspath(path), None)
+    if archive is not None:
+        archive.close()
+
+
+@atexit.register
+def _closeZips():
+    """
+    Close all the shared readers when cronometer exits.
+    """
+    for path in list(_zipFiles):
+        closeZip(path)
 
 
 def readIndex(path: Union[str, Path],
               foodSource: FoodSource) -> list[FoodProxy]:
     """
     Read an index file and return the proxies from it.
+
+    The whole file is read at once and findall splits every line into
+    its fields in a single pass. The index files are written by
+    cronometer and every field is converted here.
     """
-    toRet = list[FoodProxy]()
     with open (path, "r") as f:
-        for line in f.readlines():
-            res = INDEX_PAT.match(line)
-            legacyId = int(res.group(1)) if res.group(1) else None
-            uid = int(res.group(2))
-            name = res.group(3)
-            proxy = FoodProxy(name=name,
-                              sourceUID=int(uid),
-                              foodSource=foodSource,
-                              legacyUID=legacyId)
-            toRet.append(proxy)
-    return toRet
+        rows = INDEX_PAT.findall(f.read())
+    return [FoodProxy(name=name,
+                      sourceUID=int(uid),
+                      foodSource=foodSource,
+                      legacyUID=int(legacyId) if legacyId else None)
+            for legacyId, uid, name in rows]
@@ -18,22 +18,30 @@ usdaFoodLoader.convertUsdaFoods(foodDir, nutInfo, FoodSource.SURVEY)
 import contextlib
 import csv
 import difflib
+import functools
+import math
 import os
 import zipfile
 
+from array import array
 from collections import defaultdict
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import date
-from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import Iterable
 from typing import Optional
 from typing import Union
 
-from pydantic import BaseModel
-from pydantic import ConfigDict
+import numpy as np
+import orjson
 
 import cronometer.util.toolbox as toolbox
 
+from cronometer.datasource import usdaFoods
+from cronometer.datasource.helpers import closeZip
 from cronometer.foods.food import Food
 from cronometer.foods.food import FoodNutrient
 from cronometer.foods.food import FoodSource
@@ -57,37 +65,44 @@ CONVERSION_CSV = "food_calorie_conversion_factor.csv"
 FOOD_CONVERSION_CSV = "food_nutrient_conversion_factor.csv"
 BRANDED_CSV = "branded_food.csv"
 
+# The fewest foods worth starting a generateFoodJson worker process for.
+MIN_FOODS_PER_WORKER = 5_000
+
 
 @contextlib.contextmanager
-def _openCSV(csvFile: Union[Path, str]):
+def _parseCSV(csvFile: Union[Path, str], columns: tuple[int, ...]):
     """
     Open a CSV file and yield back an iterator over the rows with the
     first row (the header) removed.
+
+    Each row is reduced to a tuple of only the requested columns. The
+    projection is done with itemgetter inside map so that the per-row
+    work stays in C rather than in the loader loops, which matters for
+    the larger USDA files.
     """
-    with open(csvFile) as f:
+    getter = itemgetter(*columns)
+    with open(csvFile, newline="") as f:
         reader = csv.reader(f)
         next(reader) # remove the headers
-        yield reader
+        yield map(getter, reader)
 
 
-class CsvFood(BaseModel):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CsvFood:
     """
     A food entry read from the food.csv file.
     """
-    model_config = ConfigDict(frozen=True)
-
     foodSource: FoodSource
     fid: int
     legacyId: Optional[int] = None
     name: str
 
 
-class CsvNutrient(BaseModel):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CsvNutrient:
     """
     A nutrient entry read from the nutrients.csv file.
     """
-    model_config = ConfigDict(frozen=True)
-
     nid: int
     """ The Id used in the USDA csv data """
     name: str
@@ -98,22 +113,20 @@ class CsvNutrient(BaseModel):
     """ The unit of measure used in the USDA csv data. """
 
 
-class CsvMeasure(BaseModel):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CsvMeasure:
     """
     A portion's measurement name read from the measure_unit.csv file
     """
-    model_config = ConfigDict(frozen=True)
-
     pid: int
     name: str
 
 
-class CsvPortion(BaseModel):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CsvPortion:
     """
     A Portion entry read from the food_portion.csv file.
     """
-    model_config = ConfigDict(frozen=True)
-
     fid: int
     """ The id of the food this portion is for """
     seqNum: int
@@ -138,9 +151,9 @@ class CsvFoodNutrient(namedtuple("CsvFoodNutrient", ["fid", "nid", "amount"])):
 
     This data is all nutrient per 100g of the food.
 
-    This is using a namedtuple vs pydantic because the initialization speed
-    penalty from pedantic is substantial when reading 26 million nutrient
-    records from a file.
+    This is using a namedtuple vs a dataclass because it is the cheapest
+    object to create when reading 26 million nutrient records from a
+    file.
 
     fid: int
       The id of the food this nutrient is for
@@ -152,7 +165,75 @@ class CsvFoodNutrient(namedtuple("CsvFoodNutrient", ["fid", "nid", "amount"])):
     __slots__ = ()
 
 
-class CsvConversion(BaseModel):
+class FoodJson(namedtuple("FoodJson", ["uid", "legacyUID", "name", "data"])):
+    """
+    A generated food serialized to the json written into the zip file,
+    along with the fields needed to write the index.
+
+    This is a namedtuple so it is cheap to send back from a
+    generateFoodJson worker process.
+
+    uid: int
+      The USDA id of the food
+    legacyUID: Optional[int]
+      The legacy id of the food if it has one
+    name: str
+      The name of the food
+    data: bytes
+      The json for the food
+    """
+    __slots__ = ()
+
+
+@dataclass
+class CsvFoodNutrientTable:
+    """
+    All the nutrient values for foods read from the food_nutrient.csv
+    file, stored as three parallel arrays where each index is one row.
+
+    This data is all nutrient per 100g of the food.
+
+    This is used instead of a list of CsvFoodNutrient when loading the
+    full file because even a namedtuple per row is a lot of memory for
+    26 million rows, and the arrays let the foods be grouped without
+    building a Python list for each one.
+
+    fid: np.ndarray[np.int32]
+      The id of the food for each row
+    nid: np.ndarray[np.int32]
+      The id of the nutrient for each row
+    amount: np.ndarray[np.float64]
+      The nutrient amount per 100g of the food for each row
+    """
+    fid: np.ndarray
+    nid: np.ndarray
+    amount: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.fid)
+
+    def sortedByFood(self) -> "CsvFoodNutrientTable":
+        """
+        Get a copy of the table sorted by food id. The sort is stable so
+        the rows for each food stay in the order they were read.
+        """
+        order = np.argsort(self.fid, kind="stable")
+        return CsvFoodNutrientTable(fid=self.fid[order],
+                                    nid=self.nid[order],
+                                    amount=self.amount[order])
+
+    def foodRows(self, fids: np.ndarray) -> tuple[list[int], list[int]]:
+        """
+        Get the start and end row for each of the given food ids. The
+        table must already be sorted by food id.
+        """
+        starts = np.searchsorted(self.fid, fids, side="left")
+        ends = np.searchsorted(self.fid, fids, side="right")
+        return starts.tolist(), ends.tolist()
+
+
+@dataclass(kw_only=True, slots=True)
+class CsvConversion:
     """
     The calorie conversion values read from the
     food_calorie_conversion_factor.csv file.
@@ -163,7 +244,8 @@ class CsvConversion(BaseModel):
     carb: Optional[float]
 
 
-class CsvBrandedFood(BaseModel):
+@dataclass(kw_only=True, slots=True)
+class CsvBrandedFood:
     """
     The branded food extra information read from the branded_food.csv
     file
@@ -187,11 +269,9 @@ def loadLegacyIds(csvDir: Union[str, Path]) -> dict[int, int]:
     """
     toRet = dict[int, int]()
     csvFile = os.path.join(csvDir, SR_LEGACY_FOODS_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            newId = int(row[0])
-            oldId = int(row[1])
-            toRet[newId] = oldId
+    with _parseCSV(csvFile, (0, 1)) as rows:
+        for newId, oldId in rows:
+            toRet[int(newId)] = int(oldId)
     return toRet
 
 
@@ -201,12 +281,11 @@ def loadNutrients(csvDir: Union[str, Path]) -> list[CsvNutrient]:
     """
     toRet = list[CsvNutrient]()
     csvFile = os.path.join(csvDir, NUTRIENT_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            nid = int(row[0])
-            name = row[1]
-            legacyId = float(row[3]) if row[3] else None
-            unitStr = row[2].lower()
+    with _parseCSV(csvFile, (0, 1, 2, 3)) as rows:
+        for nid, name, unitStr, legacyId in rows:
+            nid = int(nid)
+            legacyId = float(legacyId) if legacyId else None
+            unitStr = unitStr.lower()
             if unitStr == "ug":
                 unitStr = "µg"
             unit = NutrientUnit(unitStr)
@@ -252,12 +331,12 @@ def loadCalorieConversion(csvDir: Union[str, Path]) -> list[CsvConversion]:
     """
     toRet = list[CsvConversion]()
     csvFile = os.path.join(csvDir, CONVERSION_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            cid = int(row[0])
-            protein = float(row[1]) if row[1] else None
-            fat = float(row[2]) if row[2] else None
-            carb = float(row[3]) if row[3] else None
+    with _parseCSV(csvFile, (0, 1, 2, 3)) as rows:
+        for cid, protein, fat, carb in rows:
+            cid = int(cid)
+            protein = float(protein) if protein else None
+            fat = float(fat) if fat else None
+            carb = float(carb) if carb else None
             conv = CsvConversion(cid=cid, protein=protein, fat=fat, carb=carb)
             toRet.append(conv)
     return toRet
@@ -273,11 +352,9 @@ def loadFoodConversions(csvDir: Union[str, Path]) -> dict[int, int]:
     """
     toRet = dict[int, int]()
     csvFile = os.path.join(csvDir, FOOD_CONVERSION_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            cid = int(row[0])
-            fid = int(row[1])
-            toRet[fid] = cid
+    with _parseCSV(csvFile, (0, 1)) as rows:
+        for cid, fid in rows:
+            toRet[int(fid)] = int(cid)
     return toRet
 
 
@@ -288,37 +365,46 @@ def generateFoodConversion(csvDir: Union[str, Path]) -> dict[int, CsvConversion]
 
     This will be a sparse dictionary because most foods do not seem to
     have this value
+
+    The food_nutrient_conversion_factor.csv rows are joined to the
+    calorie conversions as they are read rather than being loaded into
+    their own dict first.
     """
     toRet = dict[int, CsvConversion]()
-    calConversions = loadCalorieConversion(csvDir)
-    foodConversions = loadFoodConversions(csvDir)
+    calConvMap = {e.cid : e for e in loadCalorieConversion(csvDir)}
 
-    calConvMap = {e.cid : e for e in calConversions}
-    for fid, cid in foodConversions.items():
-        calConv = calConvMap.get(cid)
-        if calConv:
-            toRet[fid] = calConv
+    csvFile = os.path.join(csvDir, FOOD_CONVERSION_CSV)
+    with _parseCSV(csvFile, (0, 1)) as rows:
+        for cid, fid in rows:
+            calConv = calConvMap.get(int(cid))
+            if calConv:
+                toRet[int(fid)] = calConv
 
     return toRet
 
 
 def loadFoods(csvDir: Union[str, Path],
-              legacyIdMap: dict[int, int]) -> list[CsvFood]:
+              legacyIdMap: dict[int, int],
+              sourceFilter: Optional[FoodSource]=None) -> list[CsvFood]:
     """
     Load all the foods found in the food.csv file (the main list of
     all the foods).
 
     The legacyIdMap is used to correlate the new USDA id for foods with
     the old legacy ID that the Java version of crononmeter used.
+
+    If sourceFilter is given, only the foods from that source are
+    loaded. Rows from other sources are skipped before any conversion.
     """
     toRet = list[CsvFood]()
     csvFile = os.path.join(csvDir, FOOD_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            fid = int(row[0])
-            fsrc = FoodSource(row[1])
-            name = row[2]
-            legacyId = None if fsrc != FoodSource.LEGACY else legacyIdMap[fid]
+    with _parseCSV(csvFile, (0, 1, 2)) as rows:
+        for fid, fsrc, name in rows:
+            if sourceFilter is not None and fsrc != sourceFilter:
+                continue
+            fid = int(fid)
+            fsrc = FoodSource(fsrc)
+            legacyId = None if fsrc is not FoodSource.LEGACY else legacyIdMap[fid]
             food = CsvFood(foodSource=fsrc,
                            fid=fid,
                            name=name,
@@ -333,11 +419,9 @@ def loadMeasures(csvDir: Union[str, Path]) -> list[CsvMeasure]:
     """
     toRet = list[CsvMeasure]()
     csvFile = os.path.join(csvDir, MEASURE_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            pid = int(row[0])
-            name = row[1]
-            measure = CsvMeasure(pid=pid, name=name)
+    with _parseCSV(csvFile, (0, 1)) as rows:
+        for pid, name in rows:
+            measure = CsvMeasure(pid=int(pid), name=name)
             toRet.append(measure)
     return toRet
 
@@ -348,22 +432,17 @@ def loadPortions(csvDir: Union[str, Path]) -> list[CsvPortion]:
     """
     toRet = list[CsvPortion]()
     csvFile = os.path.join(csvDir, PORTION_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            fid = int(row[1])
-            seqNum = int(row[2]) if row[2] else 1
-            amount = float(row[3]) if row[3] else 0.0
-            measureId = int(row[4])
-            desc = row[5]
-            modifier = row[6]
-            grams = float(row[7])
-            portion = CsvPortion(fid=fid,
-                                 seqNum=seqNum,
-                                 amount=amount,
-                                 measureId=measureId,
+    with _parseCSV(csvFile, (1, 2, 3, 4, 5, 6, 7)) as rows:
+        for fid, seqNum, amount, measureId, desc, modifier, grams in rows:
+            # Empty seqNum/amount values fall back to their defaults
+            # through "or" rather than a separate test per column.
+            portion = CsvPortion(fid=int(fid),
+                                 seqNum=int(seqNum or 1),
+                                 amount=float(amount or 0.0),
+                                 measureId=int(measureId),
                                  description=desc,
                                  modifier=modifier,
-                                 grams=grams)
+                                 grams=float(grams))
             toRet.append(portion)
     return toRet
 
@@ -376,33 +455,25 @@ def generateMeasures(portions: list[CsvPortion],
     Returns a dict that is keyed with the food index with the values being the
     list of measures for that food.
     """
-    toRet = dict[int, list[Measure]]()
-
-    measureDict = {m.pid : m.name for m in measures}
-
-    for fid, pors in groupby(sorted(portions, key=lambda x: x.fid),
-                             key=lambda x: x.fid) :
-        measureList = list[Measure]()
-        for por in pors:
-            descList = list()
-            if por.measureId != 9999:
-                descList.append(measureDict[por.measureId])
-            if por.description:
-                descList.append(por.description)
-            if por.modifier:
-                descList.append(por.modifier)
-            measure = Measure(grams=por.grams,
-                              amount=por.amount,
-                              description=" ".join(descList))
-            measureList.append(measure)
-        toRet[fid] = measureList
+    toRet = defaultdict[int, list[Measure]](list)
 
-    return toRet
+    # 9999 is the legacy "undetermined" measure which is left out of the
+    # description, so it is left out of the lookup.
+    measureName = {m.pid : m.name for m in measures if m.pid != 9999}.get
+
+    for por in portions:
+        descList = (measureName(por.measureId), por.description, por.modifier)
+        measure = Measure(grams=por.grams,
+                          amount=por.amount,
+                          description=" ".join(d for d in descList if d))
+        toRet[por.fid].append(measure)
+
+    return dict(toRet)
 
 
 def loadFoodNutrients(csvDir: Union[str, Path],
                       filterIds: Optional[set[int]]=None,
-                      nutrientIds: Optional[set[int]]=None) -> list[CsvFoodNutrient]:
+                      nutrientIds: Optional[set[int]]=None) -> CsvFoodNutrientTable:
     """
     Load all the food nutrient values from the food_nutrient.csv file.
 
@@ -410,23 +481,37 @@ def loadFoodNutrients(csvDir: Union[str, Path],
     nutrients are wanted and the other is the list of ids for the nutrients
     wanted. This is because the CSV file is 26 million lines or so and it
     is preferable to not load what isn't needed.
+
+    Rows are filtered on the raw id strings so unwanted rows are never
+    converted, and the wanted values are packed straight into typed
+    arrays rather than kept as python objects.
     """
-    toRet = list[CsvFoodNutrient]()
+    fidStrs = None if filterIds is None else {str(f) for f in filterIds}
+    nidStrs = None if nutrientIds is None else {str(n) for n in nutrientIds}
+    fids = array("i")
+    nids = array("i")
+    amounts = array("d")
+
     csvFile = os.path.join(csvDir, FOOD_NUTRIENT_CSV)
-    with _openCSV(csvFile) as reader:
+    with open(csvFile, newline="") as f:
+        reader = csv.reader(f)
+        next(reader) # remove the headers
         for row in reader:
-            fid = int(row[1])
-            if filterIds is not None and fid not in filterIds:
+            fid = row[1]
+            if fidStrs is not None and fid not in fidStrs:
                 continue
 
-            nid = int(row[2])
-            if nutrientIds is not None and nid not in nutrientIds:
+            nid = row[2]
+            if nidStrs is not None and nid not in nidStrs:
                 continue
 
-            amount = float(row[3])
-            fn = CsvFoodNutrient(fid=fid, nid=nid, amount=amount)
-            toRet.append(fn)
-    return toRet
+            fids.append(int(fid))
+            nids.append(int(nid))
+            amounts.append(float(row[3]))
+
+    return CsvFoodNutrientTable(fid=np.frombuffer(fids, dtype=np.int32),
+                                nid=np.frombuffer(nids, dtype=np.int32),
+                                amount=np.frombuffer(amounts, dtype=np.float64))
 
 
 def loadOneFoodNutrients(csvDir: Union[str, Path],
@@ -437,12 +522,12 @@ def loadOneFoodNutrients(csvDir: Union[str, Path],
     """
     toRet = list[CsvFoodNutrient]()
     csvFile = os.path.join(csvDir, FOOD_NUTRIENT_CSV)
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            fid = int(row[1])
+    with _parseCSV(csvFile, (1, 2, 3)) as rows:
+        for fid, nid, amount in rows:
+            fid = int(fid)
             if fid == tgtFid:
-                nid = int(row[2])
-                amount = float(row[3])
+                nid = int(nid)
+                amount = float(amount)
                 fn = CsvFoodNutrient(fid=fid, nid=nid, amount=amount)
                 toRet.append(fn)
     return toRet
@@ -456,17 +541,14 @@ def loadBrandedFoods(csvDir: Union[str, Path]) -> list[CsvBrandedFood]:
     toRet = list[CsvBrandedFood]()
     csvFile = os.path.join(csvDir, BRANDED_CSV)
 
-    with _openCSV(csvFile) as reader:
-        for row in reader:
-            fid = int(row[0])
-            owner = row[1]
-            brand = row[2]
-            subbrand = row[3].capitalize()
+    with _parseCSV(csvFile, (0, 1, 2, 3, 7, 8, 9, 16)) as rows:
+        for fid, owner, brand, subbrand, value, unit, desc, discontinued in rows:
+            fid = int(fid)
+            subbrand = subbrand.capitalize()
 
             measure = None
-            value = row[7]
-            unit = row[8].lower()
-            desc = row[9] or "labeled serving"
+            unit = unit.lower()
+            desc = desc or "labeled serving"
             if value:
                 # Why does mg mean grams? who the f knows.
                 # According to the USDA docs, this field is either
@@ -481,7 +563,6 @@ def loadBrandedFoods(csvDir: Union[str, Path]) -> list[CsvBrandedFood]:
                                       description=desc)
 
 
-            discontinued = row[16]
             if discontinued:
                 discontinued = date.fromisoformat(discontinued)
             else:
@@ -501,33 +582,129 @@ def generateFoods(csvFoods: list[CsvFood],
                   measures: dict[int, list[Measure]],
                   conversion: dict[int, CsvConversion],
                   nutrientInfos: NutrientInfos,
-                  nutrients: list[CsvFoodNutrient],
+                  nutrients: CsvFoodNutrientTable,
                   brandInfo: list[CsvBrandedFood]) -> list[Food]:
     """
     Construct the final cronometer Food objects from the information
     loaded from the USDA CSV Files.
     """
-    toRet = list[Food]()
+    brandDict = {b.fid : b for b in brandInfo}
+    return _buildFoods(csvFoods,
+                       measures,
+                       conversion,
+                       nutrientInfos,
+                       nutrients.sortedByFood(),
+                       brandDict)
+
+
+def generateFoodJson(csvFoods: list[CsvFood],
+                     measures: dict[int, list[Measure]],
+                     conversion: dict[int, CsvConversion],
+                     nutrientInfos: NutrientInfos,
+                     nutrients: CsvFoodNutrientTable,
+                     brandInfo: list[CsvBrandedFood],
+                     workers: int=1) -> list[FoodJson]:
+    """
+    Build the foods the same as generateFoods but give each one back
+    already serialized for the zip file, along with the fields needed
+    for the index.
 
+    If workers is more than 1 the foods are split into shards that are
+    built in a pool of processes. Only the serialized bytes come back
+    from a worker, since sending whole Food objects back made the pool
+    slower than building in this process. Even then the pool only pays
+    off with several real cores and a large food set, so it has to be
+    asked for. Shards are never smaller than MIN_FOODS_PER_WORKER foods.
+    """
     brandDict = {b.fid : b for b in brandInfo}
-    foodNutDict = defaultdict(list)
-    for n in nutrients:
-        foodNutDict[n.fid].append(n)
+    nutrients = nutrients.sortedByFood()
+    data = (measures, conversion, nutrientInfos, nutrients, brandDict)
+
+    workers = min(workers, math.ceil(len(csvFoods) / MIN_FOODS_PER_WORKER))
+    if workers <= 1:
+        return [_foodJson(food) for food in _buildFoods(csvFoods, *data)]
+
+    shardSize = math.ceil(len(csvFoods) / workers)
+    shards = [csvFoods[i:i + shardSize]
+              for i in range(0, len(csvFoods), shardSize)]
+    toRet = list[FoodJson]()
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_initFoodWorker,
+                             initargs=data) as pool:
+        for foods in pool.map(_buildFoodShard, shards):
+            toRet.extend(foods)
+    return toRet
+
+
+# The shared data given to each generateFoodJson worker process.
+_workerData = None
+
+
+def _initFoodWorker(*data):
+    """
+    Stash the data shared by every shard in the worker process so that
+    it is only sent to each worker once rather than with every shard.
+    """
+    global _workerData
+    _workerData = data
+
+
+def _buildFoodShard(csvFoods: list[CsvFood]) -> list[FoodJson]:
+    """
+    Build and serialize one shard of foods in a worker process.
+    """
+    return [_foodJson(food) for food in _buildFoods(csvFoods, *_workerData)]
+
+
+def _foodJson(food: Food) -> FoodJson:
+    """
+    Serialize a food into the json written to the zip file.
+    """
+    return FoodJson(uid=food.uid,
+                    legacyUID=food.legacyUID,
+                    name=food.name,
+                    data=orjson.dumps(food.model_dump(mode="json"),
+                                      option=orjson.OPT_INDENT_2))
+
 
-    for csvFood in csvFoods:
-        foodNuts = foodNutDict[csvFood.fid]
+def _buildFoods(csvFoods: list[CsvFood],
+                measures: dict[int, list[Measure]],
+                conversion: dict[int, CsvConversion],
+                nutrientInfos: NutrientInfos,
+                nutrients: CsvFoodNutrientTable,
+                brandDict: dict[int, CsvBrandedFood]) -> list[Food]:
+    """
+    Build the Food objects for generateFoods. nutrients must already be
+    sorted by food id.
+    """
+    toRet = list[Food]()
 
-        usdaIds = set()
-        for f in foodNuts:
-            usdaIds.add(f.nid)
+    fids = np.fromiter((f.fid for f in csvFoods),
+                       dtype=np.int32,
+                       count=len(csvFoods))
+    starts, ends = nutrients.foodRows(fids)
+    nutrientSpecs = [(ni.name, tuple(ni.usdaIds))
+                     for ni in nutrientInfos.nutrients]
+
+    for csvFood, start, end in zip(csvFoods, starts, ends):
+        nids = nutrients.nid[start:end].tolist()
+        amounts = nutrients.amount[start:end].tolist()
+        nidToAmount = dict(zip(nids, amounts))
+        firstAmount = nidToAmount
+        if len(nidToAmount) < len(nids):
+            # Duplicate rows for a nutrient are summed, but the omega
+            # fix only ever used the first of them.
+            firstAmount = dict(zip(reversed(nids), reversed(amounts)))
+            nidToAmount = dict.fromkeys(firstAmount, 0.0)
+            for nid, amount in zip(nids, amounts):
+                nidToAmount[nid] += amount
 
         nutList = list[FoodNutrient]()
-        for ni in nutrientInfos.nutrients:
-            entries = [n for n in foodNuts if n.nid in ni.usdaIds]
+        for name, usdaIds in nutrientSpecs:
+            entries = [nidToAmount[nid] for nid in usdaIds if nid in nidToAmount]
             if entries:
-                amount = sum((e.amount for e in entries))
-                nutList.append(FoodNutrient(name=ni.name,
-                                            amount=amount))
+                nutList.append(FoodNutrient(name=name,
+                                            amount=sum(entries)))
 
         bi = brandDict.get(csvFood.fid)
         name = csvFood.name
@@ -552,10 +729,7 @@ def generateFoods(csvFoods: list[CsvFood],
         if bi:
             nameList = [name]
             if bi.owner and bi.brand:
-                ratio = difflib.SequenceMatcher(None,
-                                                bi.owner.lower(),
-                                                bi.brand.lower()).ratio()
-                if ratio < .5:
+                if _ownerAndBrandDiffer(bi.owner, bi.brand):
                     nameList.extend([bi.owner, bi.brand])
                 else:
                     nameList.append(bi.brand)
@@ -578,30 +752,61 @@ def generateFoods(csvFoods: list[CsvFood],
                     lCF=c.fat if c else None,
                     cCF=c.carb if c else None,
                     comments=[])
-        if _fixOmegaFats(food, foodNuts):
+        if _fixOmegaFats(food, firstAmount):
             food.nutrients.sort(key=lambda x: nutrientInfos.indexOfName(x.name))
         toRet.append(food)
     return toRet
 
 
+@functools.lru_cache(maxsize=16384)
+def _ownerAndBrandDiffer(owner: str, brand: str) -> bool:
+    """
+    Check if the owner and brand of a branded food are different enough
+    that both should be included in the food name.
+
+    This is cached since the same owner and brand pair shows up on a
+    lot of branded foods. The quick ratios are upper bounds on the real
+    ratio so the slow full comparison is only done when they can't
+    decide.
+    """
+    matcher = difflib.SequenceMatcher(None, owner.lower(), brand.lower())
+    return (matcher.real_quick_ratio() < .5 or
+            matcher.quick_ratio() < .5 or
+            matcher.ratio() < .5)
+
+
 def writeFoodsToZip(foods: list[Food], zipPath: Union[str, Path]):
     """
     Write the given foods into a zip file
     """
+    writeFoodJsonToZip(map(_foodJson, foods), zipPath)
+
+
+def writeFoodJsonToZip(foods: Iterable[FoodJson], zipPath: Union[str, Path]):
+    """
+    Write the given already serialized foods into a zip file
+
+    Deflate level 6 is used since it compresses the small food json files
+    almost as well as level 9 at a fraction of the time.
+    """
+    # Any shared reader for the old zip would be invalid once it is
+    # rewritten.
+    closeZip(zipPath)
     with zipfile.ZipFile(zipPath,
                          "w",
                          compression=zipfile.ZIP_DEFLATED,
-                         compresslevel=9) as archive:
+                         compresslevel=6) as archive:
         for food in foods:
             fileName = f"{food.uid}.json"
             with archive.open(fileName, "w") as f:
-                f.write(food.model_dump_json(indent=2).encode())
+                f.write(food.data)
 
 
 def convertUsdaFoods(csvDir: Union[str, Path],
                      nutrientInfos: NutrientInfos,
                      foodSource: FoodSource,
-                     cutDate: Optional[date]=None):
+                     cutDate: Optional[date]=None,
+                     workers: int=1):
     """
     Load the CSV data for the USDA foods and generate a zip file
     containing json files for all the foods and an index file that can
@@ -613,6 +818,9 @@ def convertUsdaFoods(csvDir: Union[str, Path],
     Cutdate is an optional value that will be used with Branded foods. If
     a branded food has a discontinued date that is before cutDate it will not
     be included in the final output.
+
+    workers is the number of processes used to build the foods, see
+    generateFoodJson.
     """
     userDir = toolbox.getUserDataDir()
     os.makedirs(userDir, exist_ok=True)
@@ -623,48 +831,51 @@ def convertUsdaFoods(csvDir: Union[str, Path],
     measures = generateMeasures(portions, csvmeasures)
     conversions = generateFoodConversion(csvDir)
 
-    legacyIds = loadLegacyIds(csvDir)
-    csvFoods = loadFoods(csvDir, legacyIds)
+    if foodSource is FoodSource.LEGACY:
+        legacyIds = loadLegacyIds(csvDir)
+    else:
+        legacyIds = dict()
+    csvFoods = loadFoods(csvDir, legacyIds, foodSource)
 
-    sliced = sorted((f for f in csvFoods if f.foodSource == foodSource),
-                    key=lambda x: x.fid)
+    sliced = sorted(csvFoods, key=lambda x: x.fid)
     foodFilter = {f.fid for f in sliced}
     nutFilter = {n for ni in nutrientInfos.nutrients for n in ni.usdaIds}
     nutrients = loadFoodNutrients(csvDir, foodFilter, nutFilter)
 
-    if foodSource == FoodSource.BRANDED:
+    if foodSource is FoodSource.BRANDED:
         brandInfo = loadBrandedFoods(csvDir)
     else:
         brandInfo = list()
 
     if cutDate:
-        foodsToCut = [bi.fid for bi in brandInfo if bi.discontinued and bi.discontinued < cutDate]
+        foodsToCut = {bi.fid for bi in brandInfo if bi.discontinued and bi.discontinued < cutDate}
         if foodsToCut:
             sliced = [f for f in sliced if f.fid not in foodsToCut]
 
-    newFoods = generateFoods(sliced,
-                             measures,
-                             conversions,
-                             nutrientInfos,
-                             nutrients,
-                             brandInfo)
+    newFoods = generateFoodJson(sliced,
+                                measures,
+                                conversions,
+                                nutrientInfos,
+                                nutrients,
+                                brandInfo,
+                                workers)
     zipPath = os.path.join(userDir, f"{foodSource.value}.zip")
-    writeFoodsToZip(newFoods, zipPath)
+    writeFoodJsonToZip(newFoods, zipPath)
     indexPath = os.path.join(userDir, f"{foodSource.value}.index")
     with open(indexPath, "w") as f:
         for food in newFoods:
             legId = f"{food.legacyUID}|||" if food.legacyUID else ""
             f.write(f"{legId}{food.uid}|{food.name}\n")
+    usdaFoods.clearCaches()
 
 
-def _fixOmegaFats(food: Food, foodNuts: list[CsvFoodNutrient]) -> bool:
+def _fixOmegaFats(food: Food, nidToAmount: dict[int, float]) -> bool:
     """
     This is the algorithem from the original java cronometer for fixing
     Omega-3 and Omega-6 fat values. Taking their word for it that it works
 
-    foodNuts should be a list of the CSV nutrients for a single food as
-    should nutList. nutList should be fully ordered as it will be when
-    passed into the Food constructor.
+    nidToAmount should map the USDA nutrient ids of a single food's CSV
+    nutrients to their amounts.
 
     ID mappings for the legacy fields to the new nutrient fields
 
@@ -674,14 +885,7 @@ def _fixOmegaFats(food: Food, foodNuts: list[CsvFoodNutrient]) -> bool:
     618 : 1269  PUFA 18:2
     675 : 1316  PUFA 18:2 n-6 c,c
     """
-    def extractValue(nid: int) -> Optional[float]:
-        """
-        Grab a value out of the foodNuts list
-        """
-        try:
-            return next(fn.amount for fn in foodNuts if fn.nid == nid)
-        except StopIteration:
-            return None
+    extractValue = nidToAmount.get
 
     w3a = food.nutrientValueByName("Omega-3")
     w6a = food.nutrientValueByName("Omega-6")
@@ -1,41 +1,78 @@
+import functools
 import os
-import zipfile
 
 from pathlib import Path
 from typing import Union
 
+import orjson
+
 from cronometer import DATA_DIR
 from cronometer.foods.food import Food
 from cronometer.foods.food import FoodProxy
 from cronometer.foods.food import FoodSource
+from cronometer.foods.food import constructFoodFields
 from cronometer.util import toolbox
 
+from .helpers import openZip
 from .helpers import readIndex
 
 DEPRECATED_ZIP = os.path.join(DATA_DIR, "deprecated.zip")
 
 
-def _getFoodFromZip(zipPath: Union[str, Path], foodId: str) -> Food:
+@functools.lru_cache(maxsize=1)
+def _dataDir() -> Path:
+    """
+    The user data directory the generated usda files are stored in.
+    """
+    return toolbox.getUserDataDir()
+
+
+@functools.lru_cache(maxsize=None)
+def _dataPath(source: FoodSource, extension: str) -> str:
+    """
+    The path of the generated data file with the given extension for a
+    USDA food source.
+    """
+    return os.path.join(_dataDir(), f"{source.value}.{extension}")
+
+
+def _fastFoodFromJson(raw: bytes) -> Food:
+    """
+    Build a food from its json data without running pydantic validation.
+
+    The generated USDA zips are written by cronometer from validated
+    foods, so they can be trusted.
+    """
+    data = orjson.loads(raw)
+    return Food.model_construct(legacyUID=data.get("legacyUID"),
+                                **constructFoodFields(data))
+
+
+def _getFoodFromZip(zipPath: Union[str, Path],
+                    foodId: str,
+                    validate: bool=False) -> Food:
     """
     Load a food from a zip file using the given id.
 
-    The id string should contain any sort of padding that is needed
+    The id string should contain any sort of padding that is needed.
+    Validation is skipped unless validate is set, so it should only be
+    left off for zips generated by cronometer.
     """
-    foodPath = f"{foodId}.json"
-    with zipfile.ZipFile(zipPath, "r") as archive:
-        with archive.open(foodPath, "r") as f:
-            return Food.model_validate_json(f.read())
+    raw = openZip(zipPath).read(f"{foodId}.json")
+    if validate:
+        return Food.model_validate(orjson.loads(raw))
+    return _fastFoodFromJson(raw)
 
 
+@functools.lru_cache(maxsize=32)
 def getUsdaProxies(foodType: FoodSource) -> list[FoodProxy]:
     """
     Get the food proxies for one of the USDA food types.
     """
-    dataDir = toolbox.getUserDataDir()
-    indexFile = os.path.join(dataDir, f"{foodType.value}.index")
-    return readIndex(indexFile, foodType)
+    return readIndex(_dataPath(foodType, "index"), foodType)
 
 
+@functools.lru_cache(maxsize=1)
 def getLegacyIdMapping() -> dict[int, int]:
     """
     Get the mapping from legacy Id to new Id for all the foods in the
@@ -44,22 +81,22 @@ def getLegacyIdMapping() -> dict[int, int]:
     This is needed to convert legacy data to work in the new python
     cronometer.
 
-    The key is the legacy id and the value is the new USDA id.
+    The key is the legacy id and the value is the new USDA id. The
+    mapping is cached, so callers must not modify it.
     """
     proxies = getUsdaProxies(FoodSource.LEGACY)
     return {p.legacyUID : p.sourceUID for p in proxies if p.legacyUID}
 
 
+@functools.lru_cache(maxsize=2048)
 def loadUsdaFood(source: FoodSource, index: int) -> Food:
     """
     Get the food identified by the given proxy.
     """
-    if source == FoodSource.DEPRECATED:
+    if source is FoodSource.DEPRECATED:
         return loadDeprecatedFood(index)
     else:
-        dataDir = toolbox.getUserDataDir()
-        zipFile = os.path.join(dataDir, f"{source.value}.zip")
-        return _getFoodFromZip(zipFile, str(index))
+        return _getFoodFromZip(_dataPath(source, "zip"), str(index))
 
 
 def loadDeprecatedFood(uid: int) -> Food:
@@ -68,7 +105,8 @@ def loadDeprecatedFood(uid: int) -> Food:
     cronometer.
     """
     foodId = f"{uid:05}"
-    return _getFoodFromZip(DEPRECATED_ZIP, foodId)
+    # This zip predates the current generator, so it is validated.
+    return _getFoodFromZip(DEPRECATED_ZIP, foodId, validate=True)
 
 
 def getDeprecatedProxies() -> list[FoodProxy]:
@@ -80,3 +118,15 @@ def getDeprecatedProxies() -> list[FoodProxy]:
     """
     return readIndex(os.path.join(DATA_DIR, "deprecated.index"),
                      FoodSource.DEPRECATED)
+
+
+def clearCaches():
+    """
+    Drop the cached proxies and foods.
+
+    This needs to be called whenever the generated USDA files are
+    rewritten.
+    """
+    getUsdaProxies.cache_clear()
+    getLegacyIdMapping.cache_clear()
+    loadUsdaFood.cache_clear()
@@ -1,24 +1,45 @@
+import functools
+
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from typing import Iterable
 from typing import Optional
 
-from lxml import etree
 from pydantic import BaseModel
+from pydantic import TypeAdapter
 from pydantic_xml import BaseXmlModel
 from pydantic_xml import attr
 from pydantic_xml import element
 
 import cronometer.foods.measure as measure
 
+from cronometer.foods.food import FoodDataMixin
 from cronometer.foods.food import FoodNutrient
 from cronometer.foods.food import FoodProxy
 from cronometer.foods.food import FoodSource
+from cronometer.util.xmlStream import iterElements
 
 from .helpers import readIndex
 
 FOOD_INDEX = "foods.index"
 
+_DATE_ADAPTER = TypeAdapter(datetime)
+
+# Threads used to overlap the file reads when loading many user foods.
+LOAD_THREADS = 8
+
+# The float attributes on a food or recipe element, as
+# (field, attribute, default).
+_FLOAT_ATTRS = (("pCF", "pcf", 4.0),
+                ("cCF", "ccf", 4.0),
+                ("lCF", "lcf", 9.0))
+
+# The elements streamed out of a user food file.
+_USER_FOOD_TAGS = ("food", "recipe", "comments", "measure", "nutrient",
+                   "serving")
+
 
 def getUserProxies(userDir: Path) -> list[FoodProxy]:
     """
@@ -33,16 +54,16 @@ class EntryType(Enum):
     RECIPE = "recipe"
 
 
-class UserFood(BaseXmlModel, tag="food"):
+class UserFood(FoodDataMixin, BaseXmlModel, tag="food"):
     name: str = attr()
     uid: str = attr()
 
     foodSource: FoodSource = attr(default=FoodSource.USER)
     entryType: EntryType = attr(default=EntryType.FOOD)
 
-    pCF: float = attr(tag="pcf", default=4.0)
-    cCF: float = attr(tag="ccf", default=4.0)
-    lCF: float = attr(tag="lcf", default=9.0)
+    pCF: float = attr(name="pcf", default=4.0)
+    cCF: float = attr(name="ccf", default=4.0)
+    lCF: float = attr(name="lcf", default=9.0)
 
     comments: list[str] = element(tag="comments", default_factory=list)
     measures: list[measure.Measure] = element(tag="measure",
@@ -54,28 +75,6 @@ class UserFood(BaseXmlModel, tag="food"):
         if measure.GRAM not in self.measures:
             self.measures.insert(0, measure.GRAM)
 
-    # TODO remove when UserFood is converted to a Food.
-    def nutrientDict(self, grams: float):
-        """
-        Get a dictionary of each nutrient to its value.adjusted for the
-        number of grams of the food.
-
-        This is sparse in that it only has nutrients included in the
-        food, not the full set of nutrients defined in the nutrientInfos
-        """
-        mult = grams / 100
-        return {n.name : (n.amount * mult) for n in self.nutrients}
-
-    # TODO remove when UserFood is converted to a Food.
-    def getMeasureByName(self, name: str) -> measure.Measure:
-        """
-        Get the food's measure based on the name that is used.
-        """
-        if not name:
-            return measure.GRAM
-        return [m for m in self.measures if m.description == name][0]
-
-
 
 class RecipeServing(BaseXmlModel, tag="serving"):
     date: datetime = attr(default_factory=datetime.now,
@@ -93,18 +92,92 @@ class UserRecipe(UserFood, tag="recipe"):
                                             default_factory=list)
 
 
+def _parseMeasure(elem) -> measure.Measure:
+    """
+    Build a measure from its xml element without validation.
+    """
+    return measure.Measure.model_construct(grams=float(elem.get("grams")),
+                                           amount=float(elem.get("amount")),
+                                           description=elem.get("name"))
+
+
+def _parseServing(elem) -> RecipeServing:
+    """
+    Build a recipe serving from its xml element without validation.
+    """
+    date = elem.get("date")
+    meal = elem.get("meal")
+    return RecipeServing.model_construct(
+        date=(_DATE_ADAPTER.validate_python(date) if date is not None
+              else datetime.now()),
+        source=elem.get("source"),
+        grams=float(elem.get("grams")),
+        food=int(elem.get("food")),
+        meal=int(meal) if meal is not None else 0,
+        measure=elem.get("measure"))
+
+
+def _parseUserFood(source) -> UserFood:
+    """
+    Build a user food or recipe by streaming through its xml.
+
+    The schema is small and fixed, so the fields are pulled out by hand
+    and handed to model_construct rather than going through
+    pydantic-xml's reflective mapping. Each element is cleared once it
+    has been read so the full tree is never kept around.
+    """
+    comments = list[str]()
+    measures = list[measure.Measure]()
+    nutrients = list[FoodNutrient]()
+    servings = list[RecipeServing]()
+    for elem in iterElements(source, _USER_FOOD_TAGS):
+        tag = elem.tag
+        if tag == "nutrient":
+            nutrients.append(
+                FoodNutrient.model_construct(name=elem.get("name"),
+                                             amount=float(elem.get("amount"))))
+        elif tag == "measure":
+            measures.append(_parseMeasure(elem))
+        elif tag == "serving":
+            servings.append(_parseServing(elem))
+        elif tag == "comments":
+            comments.append(elem.text)
+        else:
+            # The root element ends last, after all of its children.
+            values = {field: float(elem.get(name, default))
+                      for field, name, default in _FLOAT_ATTRS}
+            values.update(name=elem.get("name"),
+                          uid=elem.get("uid"),
+                          comments=comments,
+                          measures=measures,
+                          nutrients=nutrients)
+            if tag == "food":
+                return UserFood.model_construct(**values)
+            return UserRecipe.model_construct(servings=servings, **values)
+    raise ValueError(f"No food or recipe found in {source}")
+
+
 def loadUserFood(userDir: Path, index: int) -> Optional[UserFood]:
     """
     Load the user food with the given id.
     """
     foodFile = userDir / "foods" / f"{index}.xml"
     try:
-        with open(foodFile) as f:
-            root = etree.parse(f).getroot()
-            if root.tag == "food":
-                return UserFood.from_xml_tree(root)
-            return UserRecipe.from_xml_tree(root)
+        with open(foodFile, "rb") as f:
+            return _parseUserFood(f)
     except Exception as ex:
         # TODO add logging here
         print(ex)
         return None
+
+
+def loadUserFoods(userDir: Path,
+                  indices: Iterable[int]) -> list[Optional[UserFood]]:
+    """
+    Load the user foods with the given ids, in the same order.
+
+    The files are read on a small thread pool so that the time spent
+    waiting on the disk overlaps.
+    """
+    with ThreadPoolExecutor(max_workers=LOAD_THREADS) as ex:
+        return list(ex.map(functools.partial(loadUserFood, userDir), indices))
@@ -1,20 +1,27 @@
 """
 
 """
+import functools
+
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 from typing import Optional
 
+import numpy as np
+
 from pydantic import BaseModel
 from pydantic import field_validator
 from pydantic_xml import BaseXmlModel
 from pydantic_xml import attr
 
+from cronometer.foods.nutritionInfo import NutrientInfos
+
 from .measure import GRAM
 from .measure import Measure
 
 
-class FoodSource(Enum):
+class FoodSource(str, Enum):
     """
     Where the data for this food was loaded from.
 
@@ -25,6 +32,9 @@ class FoodSource(Enum):
     DEPRECATED foods are LEGACY  foods that are no longer part of the
     data set. The Python cronometer provides a zip file that contains
     these foods so that old files will still load.
+
+    The members are also strings so comparing against the raw values
+    read from data files is a plain string compare.
     """
     # User created foods
     USER = "user"
@@ -56,10 +66,14 @@ class FoodNutrient(BaseXmlModel, tag="nutrient"):
     amount: float = attr()
 
 
-class FoodProxy(BaseModel):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FoodProxy:
     """
     A lightweight proxy for a food that will be used to load the actual
     food when the data is needed.
+
+    Proxies are only built by cronometer from its own index files, so
+    this is a plain dataclass rather than a validated model.
     """
     name: str
     sourceUID: int
@@ -67,7 +81,157 @@ class FoodProxy(BaseModel):
     legacyUID: Optional[int] = None
 
 
-class Food(BaseModel):
+def constructFoodFields(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Get the fields shared by Food and UserFood from a food's json data,
+    ready to pass to model_construct.
+
+    This skips pydantic validation, so it should only be used on data
+    cronometer wrote itself or ships with. model_construct does not
+    build nested models, so the measures and nutrients are constructed
+    here as well.
+    """
+    return dict(name=data["name"],
+                uid=data["uid"],
+                foodSource=FoodSource(data["foodSource"]),
+                pCF=data["pCF"],
+                cCF=data["cCF"],
+                lCF=data["lCF"],
+                comments=data["comments"],
+                measures=[Measure.model_construct(**m)
+                          for m in data["measures"]],
+                nutrients=[FoodNutrient.model_construct(**n)
+                           for n in data["nutrients"]])
+
+
+class _FoodCache(object):
+    """
+    The lookups a food builds from its nutrients and measures the first
+    time they are needed.
+
+    They are kept together in this one object in the food's __dict__ so
+    that pydantic's __dict__ compare never sees the numpy arrays. The
+    cache always compares equal, so foods are equal whenever their
+    fields are.
+    """
+    __slots__ = ("nutrientsByName", "nutrientArrays", "nutrientVector",
+                 "measuresByName")
+
+    def __init__(self):
+        self.nutrientsByName = None
+        self.measuresByName = None
+        self.clearNutrients()
+
+    def clearNutrients(self):
+        """
+        Drop the nutrient arrays after a nutrient amount is changed.
+        """
+        self.nutrientArrays = None
+        self.nutrientVector = None
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _FoodCache)
+
+    __hash__ = None
+
+
+class FoodDataMixin(object):
+    """
+    The nutrient and measure lookups shared by Food and UserFood.
+
+    The class using this must have nutrients and measures fields.
+    """
+    @functools.cached_property
+    def _cache(self) -> _FoodCache:
+        """
+        The cached lookups for this food.
+        """
+        return _FoodCache()
+
+    @property
+    def _nutrientArrays(self) -> tuple[tuple[str, ...], np.ndarray]:
+        """
+        The nutrient names and their amounts per 100g as parallel
+        arrays, built the first time they are needed.
+        """
+        cache = self._cache
+        if cache.nutrientArrays is None:
+            names = tuple(n.name for n in self.nutrients)
+            amounts = np.fromiter((n.amount for n in self.nutrients),
+                                  dtype=np.float64,
+                                  count=len(self.nutrients))
+            cache.nutrientArrays = (names, amounts)
+        return cache.nutrientArrays
+
+    def nutrientDict(self, grams: float):
+        """
+        Get a dictionary of each nutrient to its value.adjusted for the
+        number of grams of the food.
+
+        This is sparse in that it only has nutrients included in the
+        food, not the full set of nutrients defined in the nutrientInfos
+        """
+        names, amounts = self._nutrientArrays
+        return dict(zip(names, (amounts * (grams / 100)).tolist()))
+
+    def nutrientVector(self, nutrientInfos: NutrientInfos) -> np.ndarray:
+        """
+        Get the amount per 100g of every nutrient in nutrientInfos, in the
+        same order as its list of nutrients.
+
+        Unlike nutrientDict this is dense, with zero for any nutrient the
+        food does not have. The vector is built once and shared, so it is
+        read only.
+        """
+        cache = self._cache
+        cached = cache.nutrientVector
+        if cached is not None and cached[0] is nutrientInfos:
+            return cached[1]
+        names, amounts = self._nutrientArrays
+        positions = nutrientInfos.nutrientPositions(names)
+        known = positions >= 0
+        vector = np.zeros(len(nutrientInfos.nutrients))
+        vector[positions[known]] = amounts[known]
+        vector.flags.writeable = False
+        cache.nutrientVector = (nutrientInfos, vector)
+        return vector
+
+    def nutrientArray(self,
+                      grams: float,
+                      nutrientInfos: NutrientInfos) -> np.ndarray:
+        """
+        Get the amount of every nutrient in nutrientInfos for the number of
+        grams of the food, in the same order as its list of nutrients.
+
+        This is the dense array form of nutrientDict.
+        """
+        return self.nutrientVector(nutrientInfos) * (grams / 100)
+
+    @property
+    def _measuresByName(self) -> dict[str, Measure]:
+        """
+        Mapping of measure description to the measure, built the first
+        time a measure is looked up by name.
+        """
+        cache = self._cache
+        if cache.measuresByName is None:
+            # Reversed so the first measure wins if a name is repeated.
+            cache.measuresByName = {m.description : m
+                                    for m in reversed(self.measures)}
+        return cache.measuresByName
+
+    def getMeasureByName(self, name: str) -> Measure:
+        """
+        Get the food's measure based on the name that is used.
+
+        Falls back to grams if the food has no measure with that name.
+        """
+        if not name:
+            return GRAM
+        return self._measuresByName.get(name, GRAM)
+
+
+class Food(FoodDataMixin, BaseModel):
     name: str
     uid: int
     """ The id for the food."""
@@ -83,47 +247,43 @@ class Food(BaseModel):
 
     foodSource: FoodSource
 
+    @property
+    def _nutrientsByName(self) -> dict[str, FoodNutrient]:
+        """
+        Mapping of nutrient name to the nutrient entry, built the first
+        time a nutrient is looked up by name.
+
+        This maps to the entries rather than their positions so that
+        re-ordering the nutrients list does not invalidate it.
+        """
+        cache = self._cache
+        if cache.nutrientsByName is None:
+            # Reversed so the first entry wins if a name is repeated.
+            cache.nutrientsByName = {n.name : n
+                                     for n in reversed(self.nutrients)}
+        return cache.nutrientsByName
+
     def nutrientValueByName(self, name: str) -> float:
         """
         Get a nutrient value by name.
 
         Will return zero if a nutrient is not set.
         """
-        for nut in self.nutrients:
-            if nut.name == name:
-                return nut.amount
-        return 0.0
+        nut = self._nutrientsByName.get(name)
+        return nut.amount if nut is not None else 0.0
 
     def setNutrientByName(self, name: str, amount: float):
         """
         Set a nutrient by name
         """
-        for nut in self.nutrients:
-            if nut.name == name:
-                nut.amount = amount
-                return
+        self._cache.clearNutrients()
+        nut = self._nutrientsByName.get(name)
+        if nut is not None:
+            nut.amount = amount
+            return
         fn = FoodNutrient(name=name, amount=amount)
         self.nutrients.append(fn)
-
-    def nutrientDict(self, grams: float):
-        """
-        Get a dictionary of each nutrient to its value.adjusted for the
-        number of grams of the food.
-
-        This is sparse in that it only has nutrients included in the
-        food, not the full set of nutrients defined in the nutrientInfos
-        """
-        mult = grams / 100
-        return {n.name : (n.amount * mult) for n in self.nutrients}
-
-    def getMeasureByName(self, name: str) -> Measure:
-        """
-        Get the food's measure based on the name that is used.
-        """
-        if not name:
-            return GRAM
-        return [m for m in self.measures if m.description == name][0]
-
+        self._nutrientsByName[name] = fn
 
     @field_validator('cCF', mode="before")
     @classmethod
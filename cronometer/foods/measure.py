@@ -1,21 +1,32 @@
 """
 """
+import functools
 
+from pydantic import ConfigDict
 from pydantic_xml import BaseXmlModel
 from pydantic_xml import attr
 
 
 class Measure(BaseXmlModel, tag="measure"):
+    """
+    A named amount of a food and its weight in grams.
+
+    Measures are frozen since they are shared between foods, GRAM
+    especially, which is also what makes caching displayName safe.
+    """
+    model_config = ConfigDict(frozen=True)
+
     grams: float = attr()
     amount: float = attr()
     description: str = attr(name="name")
 
-    @property
+    @functools.cached_property
     def displayName(self) -> str:
         """
         The display name for the measure.
 
-        This combines amount (if it is non-zero) with description
+        This combines amount (if it is non-zero) with description. It is
+        worked out the first time it is used, since measures are frozen.
         """
         if self.amount == 0.0:
             return self.description
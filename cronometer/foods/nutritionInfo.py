@@ -4,11 +4,14 @@ recommended daily intakes.
 """
 import os
 
+from dataclasses import dataclass
 from enum import Enum
+from typing import Iterable
 from typing import Optional
 
-from pydantic import BaseModel
-from pydantic import ConfigDict
+import numpy as np
+
+from pydantic import TypeAdapter
 from pydantic import computed_field
 from pydantic_xml import BaseXmlModel
 from pydantic_xml import attr
@@ -48,12 +51,15 @@ class NutrientUnit(Enum):
     MILLIGRAM_GAE = "mg_gae"
 
 
-class NutrientInfo(BaseModel):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class NutrientInfo:
     """
     The NutrientInfo used in the python cronometer.
-    """
-    model_config = ConfigDict(frozen=True)
 
+    These are loaded once and never changed, so they are plain frozen
+    dataclasses. Validation happens through the TypeAdapter when the
+    nutrient file is loaded.
+    """
     name: str
     unit: NutrientUnit
     category: NutrientCategory
@@ -70,57 +76,64 @@ class NutrientInfo(BaseModel):
     """ The index for the nutrient in cronometer data"""
 
 
-class NutrientInfos(BaseModel, frozen=True):
+@dataclass(frozen=True)
+class NutrientInfos:
     nutrients: list[NutrientInfo]
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    def __post_init__(self):
+        # Set with object.__setattr__ since the dataclass is frozen.
         object.__setattr__(self,
-                           "__nutrients",
-                           sorted(self.nutrients, key=lambda x: x.cronIndex))
-        object.__setattr__(self,
-                           "__nutIndexDict",
+                           "_cronIndexByName",
                            {n.name : n.cronIndex for n in self.nutrients})
+        # Reversed so the first entry wins if a name is repeated.
+        object.__setattr__(self,
+                           "_byName",
+                           {n.name : n for n in reversed(self.nutrients)})
+        object.__setattr__(self,
+                           "_names",
+                           tuple(n.name for n in self.nutrients))
+        object.__setattr__(self,
+                           "_nameToIdx",
+                           {name : i for i, name in enumerate(self._names)})
 
     def getByName(self, name: str) -> Optional[NutrientInfo]:
         """
         Get the nutrient info by name
         """
-        try:
-            return next(n for n in self.nutrients if n.name == name)
-        except StopIteration:
-            return None
+        return self._byName.get(name)
 
     def indexOfName(self, name: str) -> int:
         """
-        Get the index for the given nutrient name
+        Get the cronometer index for the given nutrient name
         """
-        return self.__nutIndexDict.get(name)
+        return self._cronIndexByName.get(name)
 
     def ordering(self) -> list[str]:
         """
         Get the list of nutrients in order
         """
-        return [n.name for n in self.nutrients]
+        return list(self._names)
 
-    def nutrientDictToTuple(self, nutrientDict: dict[str, float]) -> tuple:
+    def nutrientPositions(self, names: Iterable[str]) -> np.ndarray:
         """
-        Generate a tuple of nutrient values in the smae order as the list
-        of nutrients in this class.
+        Get the position of each of the named nutrients in the list of
+        nutrients in this class.
 
-        nutrientDict should have a key that is the nutrient name and the
-        value of the amount of the nutrient. Zero will be inserted into the
-        tuple for any value that is not in the dict.
+        -1 is used for any name that is not a known nutrient.
         """
-        return tuple((nutrientDict.get(n.name, 0) for n in self.nutrients))
+        get = self._nameToIdx.get
+        return np.fromiter((get(n, -1) for n in names), dtype=np.intp)
+
+
+_NUTRIENT_INFOS_ADAPTER = TypeAdapter(NutrientInfos)
 
 
 def loadNutrientInfo() -> NutrientInfos:
     """
     Load the nutrient info file from the cronometer data directory
     """
-    with open(os.path.join(DATA_DIR, "nutrients.json"), "r") as f:
-        return NutrientInfos.model_validate_json(f.read())
+    with open(os.path.join(DATA_DIR, "nutrients.json"), "rb") as f:
+        return _NUTRIENT_INFOS_ADAPTER.validate_json(f.read())
 
 
 class UsdaIdx(BaseXmlModel):
@@ -5,12 +5,26 @@ from datetime import date as dtdate
 from datetime import datetime
 
 from pydantic import BaseModel
+from pydantic import TypeAdapter
 from pydantic import computed_field
 from pydantic_xml import BaseXmlModel
 from pydantic_xml import attr
 
 from cronometer.foods.food import FoodSource
 from cronometer.util import toolbox
+from cronometer.util.xmlStream import iterElements
+
+# Parses the legacy serving dates the same way the LegacyServing model
+# does. The java cronometer stores them as epoch milliseconds. The
+# adapter is built once and every date in a file goes through it in a
+# single call.
+_DATES_ADAPTER = TypeAdapter(list[datetime])
+
+# The food source for each of the java cronometer's serving sources.
+# USDA foods that are no longer in the dataset are DEPRECATED instead.
+_LEGACY_SOURCES = {"USDA": FoodSource.LEGACY,
+                   "CRDB": FoodSource.CRDB,
+                   "My Foods": FoodSource.USER}
 
 
 class Serving(BaseModel):
@@ -48,15 +62,39 @@ class _LegacyServings(BaseXmlModel, tag="servings"):
     servings: list[LegacyServing]
 
 
+def _parseLegacyServing(attrib: dict[str, str],
+                        dtime: datetime) -> LegacyServing:
+    """
+    Build a legacy serving from its xml attributes without validation.
+    """
+    meal = attrib.get("meal")
+    return LegacyServing.model_construct(
+        dtime=dtime,
+        meal=int(meal) if meal is not None else 0,
+        measure=attrib.get("measure", ""),
+        source=attrib.get("source"),
+        grams=float(attrib.get("grams")),
+        food=int(attrib.get("food")))
+
+
 def loadLegacyServings(userName: str) -> list[LegacyServing]:
     """
     Get the list of servings for the given user
+
+    The file is written by the java cronometer and only has a handful of
+    attributes per serving, so they are read directly from the xml instead
+    of going through pydantic-xml. The file is streamed and each serving
+    is dropped once it has been read, so years of history never have to
+    be held as a tree.
     """
     profileDir = toolbox.getUserProfileDir(userName)
     servingsFile = os.path.join(profileDir, "servings.xml")
 
-    with open(servingsFile, 'r') as f:
-        return _LegacyServings.from_xml(f.read()).servings
+    attribs = list[dict[str, str]]()
+    for elem in iterElements(servingsFile, "serving"):
+        attribs.append(dict(elem.attrib))
+    dates = _DATES_ADAPTER.validate_python([a.get("date") for a in attribs])
+    return [_parseLegacyServing(a, d) for a, d in zip(attribs, dates)]
 
 
 def convertServings(legacy: list[LegacyServing],
@@ -67,25 +105,25 @@ def convertServings(legacy: list[LegacyServing],
     converting all the old food id values into new ones.
     """
     toRet = list[Serving]()
+    deprecated = set(deprecatedIds)
     for ls in legacy:
-        if ls.source == "USDA":
-            if ls.food in deprecatedIds:
-                source = FoodSource.DEPRECATED
-            else:
-                source = FoodSource.LEGACY
-        elif ls.source == "CRDB":
-            source = FoodSource.CRDB
-        elif ls.source == "My Foods":
-            source = FoodSource.USER
-        else:
+        source = _LEGACY_SOURCES.get(ls.source)
+        if source is None:
             raise ValueError(
                 f"Cannot convert legacy source {ls.source} to a FoodSource")
-        uid = legacyMap[ls.food] if source == FoodSource.LEGACY else ls.food
-        serving = Serving(date=ls.date,
-                          source=source,
-                          food=uid,
-                          grams=ls.grams,
-                          measure=ls.measure,
-                          meal=ls.meal)
+        uid = ls.food
+        if source is FoodSource.LEGACY:
+            if uid in deprecated:
+                source = FoodSource.DEPRECATED
+            else:
+                uid = legacyMap[uid]
+        # The legacy servings have already been converted to the right
+        # types, so there is nothing left to validate.
+        serving = Serving.model_construct(date=ls.date,
+                                          source=source,
+                                          food=uid,
+                                          grams=ls.grams,
+                                          measure=ls.measure,
+                                          meal=ls.meal)
         toRet.append(serving)
     return toRet
@@ -1,9 +1,9 @@
 """
 """
 from typing import Any
+from typing import NamedTuple
 from typing import Optional
 
-from pydantic import BaseModel
 from Qt import QtCore
 from Qt import QtGui
 from Qt import QtWidgets
@@ -23,7 +23,7 @@ COLUMNS = [COL_FOOD,
            COL_CALORIES]
 
 
-class _Food(BaseModel):
+class _Food(NamedTuple):
     servingIndex: int
     """ The index into the servings array in the user day """
     meal: int
@@ -32,7 +32,7 @@ class _Food(BaseModel):
     """ The tree row this food belongs to. """
 
 
-class _Meal(BaseModel):
+class _Meal(NamedTuple):
     mid: int
     """ The meal number """
     row: int
@@ -53,16 +53,23 @@ class ServingModel(QtCore.QAbstractItemModel):
     for your model are presented.
     """
 
-    # FIXME Quick hack to prevent index objects from going out of scope.
-    TESTER = list()
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.__userDay: Optional[UserDay] = None
 
+        # The row layout only changes with the user day, so it is worked
+        # out once per day rather than on every call from the view.
+        self.__rows: Optional[list[_Meal | _Food]] = None
+        self.__mealRows = dict[int, list[_Food]]()
+        self.__mealsById = dict[int, _Meal]()
+
     def setUserDay(self, userDay: Optional[UserDay]):
         self.beginResetModel()
         self.__userDay = userDay
+        self.__rows = None
+        self.__mealRows.clear()
+        self.__mealsById.clear()
         self.endResetModel()
 
     def index(self, row: int, column: int, parent: QtCore.QModelIndex) -> QtCore.QModelIndex:
@@ -70,11 +77,9 @@ class ServingModel(QtCore.QAbstractItemModel):
             return QtCore.QModelIndex()
 
         if parent.isValid():
-            meal = parent.internalPointer().mid
-            mealServing = self.__userDay.getMealServings(meal)[row]
-            servingIndex = self.__userDay.servings().index(mealServing)
-            data = _Food(servingIndex=servingIndex, meal=meal, row=row)
-            self.TESTER.append(data)
+            # The row objects are owned by the cached layout, which keeps
+            # them alive for as long as the index pointers are in use.
+            data = self.__calculateMealRow(parent.internalPointer().mid)[row]
             return self.createIndex(row, column, data)
         else:
             data = self.__calculateRows()[row]
@@ -87,9 +92,10 @@ class ServingModel(QtCore.QAbstractItemModel):
         idxData = index.internalPointer()
         if isinstance(idxData, _Food):
             if idxData.meal != 0:
-                for r in self.__calculateRows():
-                    if isinstance(r, _Meal) and r.mid == idxData.meal:
-                        return self.createIndex(r.row, 0, r)
+                self.__calculateRows()
+                r = self.__mealsById.get(idxData.meal)
+                if r is not None:
+                    return self.createIndex(r.row, 0, r)
 
         return QtCore.QModelIndex()
 
@@ -156,8 +162,9 @@ class ServingModel(QtCore.QAbstractItemModel):
         return None
 
     def __calculateRows(self) -> list[_Meal | _Food]:
+        if self.__rows is not None:
+            return self.__rows
         rows = list()
-        meals = set[int]()
         row = 0
         if self.__userDay:
             for i, e in enumerate(self.__userDay.servings()):
@@ -166,27 +173,27 @@ class ServingModel(QtCore.QAbstractItemModel):
                                       meal=0,
                                       row=row))
                     row += 1
-                elif e.meal not in meals:
-                    rows.append(_Meal(mid=e.meal,
-                                      row=row))
-                    meals.add(e.meal)
+                elif e.meal not in self.__mealsById:
+                    meal = _Meal(mid=e.meal,
+                                 row=row)
+                    rows.append(meal)
+                    self.__mealsById[e.meal] = meal
                     row += 1
-        self.TESTER.extend(rows)
+        self.__rows = rows
         return rows
 
     def __calculateMealRow(self, meal: int) -> list[_Food]:
         """
         """
+        rows = self.__mealRows.get(meal)
+        if rows is not None:
+            return rows
         rows = list()
         if self.__userDay:
-            row = 0
-            for i, e in enumerate(self.__userDay.servings()):
-                if e.meal == meal:
-                    rows.append(_Food(servingIndex=i,
-                                      meal=meal,
-                                      row=row))
-                    row +=1
-        self.TESTER.extend(rows)
+            indices = self.__userDay.getMealServingIndices(meal)
+            rows = [_Food(servingIndex=i, meal=meal, row=row)
+                    for row, i in enumerate(indices)]
+        self.__mealRows[meal] = rows
         return rows
 
     def __getServing(self, meal: int, index: int) -> Serving:
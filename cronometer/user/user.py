@@ -1,5 +1,6 @@
 import os
 
+from collections import defaultdict
 from datetime import date
 from typing import Optional
 
@@ -10,6 +11,8 @@ from pydantic_xml import element
 
 import cronometer.util.toolbox as toolbox
 
+from cronometer.util.xmlStream import iterElements
+
 BD_DAY = "birthdate.day"
 BD_MONTH = "birthdate.month"
 BD_YEAR = "birthdate.year"
@@ -51,7 +54,6 @@ class User(BaseModel):
         year = self.getInt(BD_YEAR) or 1944
         month = self.getInt(BD_MONTH) or 6
         day = self.getInt(BD_DAY) or 6
-        print(f"{year}-{month:02}-{day:02}")
         self._BIRTHDAY = date.fromisoformat(f"{year}-{month:02}-{day:02}")
 
     def getValue(self, name: str) -> Optional[str]:
@@ -79,19 +81,33 @@ class LegacySettings(BaseXmlModel, tag="Settings"):
         """
         Get the list of users that exist.
         """
-        toRet = list[User]()
-        userNames = {u.username for u in self.user}
-        for user in userNames:
-            settings = [s for s in self.user if s.username == user]
-            toRet.append(User(username=user, settings=settings))
-        return toRet
+        settingsByUser = defaultdict[str, list[LegacyUserSetting]](list)
+        for s in self.user:
+            settingsByUser[s.username].append(s)
+        return [User(username=user, settings=settings)
+                for user, settings in settingsByUser.items()]
 
 
 def loadLegacySettings() -> LegacySettings:
     """
     Load the legacy settings.
+
+    The settings are simple name/value pairs, so they are read directly
+    from the xml instead of going through pydantic-xml. The file is
+    streamed and each setting is dropped once it has been read.
     """
     userDir = toolbox.getUserAppDirectory()
     settingsFile = os.path.join(userDir, "Settings.xml")
-    with open(settingsFile, 'r') as f:
-        return LegacySettings.from_xml(f.read())
+    general = list[LegacyGeneralSetting]()
+    user = list[LegacyUserSetting]()
+    for elem in iterElements(settingsFile, ("General", "User")):
+        if elem.tag == "User":
+            user.append(
+                LegacyUserSetting.model_construct(name=elem.get("name"),
+                                                  value=elem.get("value"),
+                                                  username=elem.get("username")))
+        else:
+            general.append(
+                LegacyGeneralSetting.model_construct(name=elem.get("name"),
+                                                     value=elem.get("value")))
+    return LegacySettings.model_construct(general=general, user=user)
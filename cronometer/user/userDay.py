@@ -3,10 +3,14 @@ A wrapper for a single day for a single user.
 """
 
 from collections import defaultdict
+from typing import Optional
+
+import numpy as np
 
 from cronometer.core.foodManager import FoodManager
 from cronometer.foods.food import Food
 from cronometer.foods.food import FoodNutrient
+from cronometer.foods.food import FoodSource
 from cronometer.foods.serving import Serving
 
 
@@ -22,11 +26,14 @@ class UserDay(object):
         self.__foods = list()
         self.__servingSize = list()
         self.__meals = list[int]()
-        self.__servingsByMeal = dict[int, list[Serving]]
+        self.__servingsByMeal = dict[int, list[Serving]]()
+        self.__servingIndicesByMeal = dict[int, list[int]]()
 
-        self.__nutrition = tuple()
-        self.__mealNutrition = dict[int, tuple]()
-        self.__servingTuples = list[tuple]()
+        self.__nutrition = np.zeros(0)
+        self.__mealNutrition: Optional[dict[int, np.ndarray]] = None
+        self.__servingNutrition = np.zeros((0, 0))
+        self.__mealSlots = dict[int, int]()
+        self.__servingMealSlot = np.zeros(0, dtype=np.intp)
 
         self.__build()
 
@@ -39,11 +46,12 @@ class UserDay(object):
         """
         return self.__foods[index]
 
-    def getNutrition(self, index: int) -> tuple:
+    def getNutrition(self, index: int) -> np.ndarray:
         """
-        Get the nutrition tuple by serving index
+        Get the nutrition values by serving index, in the same order as
+        the nutrient infos.
         """
-        return self.__servingTuples[index]
+        return self.__servingNutrition[index]
 
     def getAmount(self, index: int) -> float:
         """
@@ -59,11 +67,41 @@ class UserDay(object):
         return self.__meals
 
     def getMealServings(self, meal: int) -> list[Serving]:
-        return [s for s in self.__servings if s.meal == meal]
+        """
+        Get the servings in the given meal, in the order they were added.
+
+        Meal 0 holds the servings that are not part of any meal.
+        """
+        return self.__servingsByMeal.get(meal, [])
+
+    def getMealServingIndices(self, meal: int) -> list[int]:
+        """
+        Get the serving indexes of the servings in the given meal, in the
+        same order as getMealServings.
+        """
+        return self.__servingIndicesByMeal.get(meal, [])
 
-    def getMealNutrition(self, meal: int) -> tuple:
+    def getMealNutrition(self, meal: int) -> np.ndarray:
+        """
+        Get the total nutrition values for the servings in a meal.
+
+        The meal totals are only summed the first time one is asked for.
+        """
+        if self.__mealNutrition is None:
+            self.__sumMeals()
         return self.__mealNutrition[meal]
 
+    def __sumMeals(self):
+        """
+        Total the nutrition of every meal in a single pass over the
+        servings.
+        """
+        totals = np.zeros((len(self.__mealSlots),
+                           self.__servingNutrition.shape[1]))
+        np.add.at(totals, self.__servingMealSlot, self.__servingNutrition)
+        self.__mealNutrition = {meal : totals[slot]
+                                for meal, slot in self.__mealSlots.items()}
+
     def __build(self):
         """
         Construct all the data structures that will make querying the
@@ -75,30 +113,53 @@ class UserDay(object):
         self.__servingsByMeal = defaultdict[int, list[Serving]](list)
 
         nutInfo = self.__manager.nutrientInfo()
-
-        mealTuples = defaultdict[int, list](list)
-        self.__servingTuples = list[tuple]()
-
-        for s in self.__servings:
-            food = self.__manager.getFood(s.source, s.food)
-            self.__foods.append(food)
-
-            nutrientDict = food.nutrientDict(s.grams)
-            nutrientTuple = nutInfo.nutrientDictToTuple(nutrientDict)
-            self.__servingTuples.append(nutrientTuple)
-
-            measure = food.getMeasureByName(s.measure)
-            servingSize = s.grams / measure.grams
-            self.__servingSize.append(servingSize)
-
-            if s.meal != 0:
-                meals.add(s.meal)
-                mealTuples[s.meal].append(nutrientTuple)
-                self.__servingsByMeal[s.meal].append(s)
-
-        self.__nutrition = tuple((sum(a) for a in zip(*self.__servingTuples)))
-        self.__mealNutrition.clear()
-        for meal, tup in mealTuples.items():
-            self.__mealNutrition[meal] = tuple((sum(a) for a in zip(*tup)))
+        numNutrients = len(nutInfo.nutrients)
+
+        # Each row is the nutrition for one serving, in nutrient order.
+        self.__servingNutrition = np.zeros((len(self.__servings),
+                                            numNutrients))
+        self.__servingIndicesByMeal = defaultdict[int, list[int]](list)
+        grams = np.fromiter((s.grams for s in self.__servings),
+                            dtype=np.float64,
+                            count=len(self.__servings))
+        measureGrams = np.ones(len(self.__servings))
+        # Each meal gets a row in the meal totals, in the order the meals
+        # are first seen.
+        self.__mealSlots = dict[int, int]()
+        self.__servingMealSlot = np.zeros(len(self.__servings), dtype=np.intp)
+
+        # Locals for the loop, so repeat servings of a food only go
+        # through the manager once per build.
+        getFood = self.__manager.getFood
+        foodCache = dict[tuple[FoodSource, int], Food]()
+        foods = self.__foods
+        servingNutrition = self.__servingNutrition
+        servingsByMeal = self.__servingsByMeal
+        servingIndicesByMeal = self.__servingIndicesByMeal
+        servingMealSlot = self.__servingMealSlot
+        mealSlots = self.__mealSlots
+
+        for i, s in enumerate(self.__servings):
+            key = (s.source, s.food)
+            food = foodCache.get(key)
+            if food is None:
+                food = getFood(s.source, s.food)
+                foodCache[key] = food
+            foods.append(food)
+
+            servingNutrition[i] = food.nutrientArray(s.grams, nutInfo)
+
+            measureGrams[i] = food.getMeasureByName(s.measure).grams
+
+            meal = s.meal
+            servingsByMeal[meal].append(s)
+            servingIndicesByMeal[meal].append(i)
+            servingMealSlot[i] = mealSlots.setdefault(meal, len(mealSlots))
+            if meal != 0:
+                meals.add(meal)
+
+        self.__servingSize = (grams / measureGrams).tolist()
+        self.__nutrition = self.__servingNutrition.sum(axis=0)
+        self.__mealNutrition = None
 
         self.__meals = sorted(meals)
@@ -1,3 +1,4 @@
+import functools
 import os
 import platform
 
@@ -13,9 +14,13 @@ class OperatingSystem(Enum):
     LINUX = "linux"
 
 
+@functools.lru_cache(maxsize=1)
 def operatingSystem() -> OperatingSystem:
     """
     Get the operating system that is being run on.
+
+    This cannot change while cronometer is running, so it is only
+    worked out once.
     """
     system = platform.system()
     if system.startswith('Windows'):
@@ -25,12 +30,14 @@ def operatingSystem() -> OperatingSystem:
     return OperatingSystem.LINUX
 
 
+@functools.lru_cache(maxsize=1)
 def getUserDirectory() -> Path:
     """
     Get the system specific user data directory.
 
     Returns the appropriate location to store application
-    data for the user, on the current platform.
+    data for the user, on the current platform. This is cached, since
+    the home directory does not change while cronometer is running.
     """
     home = Path.home()
     opSys = operatingSystem()
@@ -41,6 +48,7 @@ def getUserDirectory() -> Path:
     return home
 
 
+@functools.lru_cache(maxsize=1)
 def getUserAppDirectory() -> Path:
     """
     Get the cronometer directory.
@@ -0,0 +1,27 @@
+"""
+Streaming reads of the xml files written by the java cronometer.
+"""
+import os
+
+from typing import IO
+from typing import Iterator
+from typing import Union
+
+from lxml import etree
+
+
+def iterElements(source: Union[str, os.PathLike, IO[bytes]],
+                 tag: Union[str, tuple[str, ...]]) -> Iterator[etree._Element]:
+    """
+    Stream the elements with the given tag, or tags, out of an xml file.
+
+    Each element is yielded once it has been fully read. When the caller
+    moves on it is cleared and any earlier siblings are dropped, so the
+    whole tree is never held in memory. Anything needed from an element
+    has to be read before asking for the next one.
+    """
+    for _, elem in etree.iterparse(source, events=("end",), tag=tag):
+        yield elem
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
@@ -9,6 +9,10 @@ def static_vars(**kwargs):
     return decorate
 
 
+# Format strings for cleanNumber, keyed by the number of decimal places.
+_DECIMAL_FORMATS = {d : f"{{:.{d}f}}" for d in range(7)}
+
+
 def cleanNumber(number: Union[int, float], decimal:int=1):
     """
     Cleanly format a number.
@@ -17,5 +21,5 @@ def cleanNumber(number: Union[int, float], decimal:int=1):
     """
     if isinstance(number, int) or number.is_integer():
         return str(int(number))
-    fstr = f"{{number:.{decimal}f}}"
-    return fstr.format(number=number).rstrip("0").rstrip(".")
+    fstr = _DECIMAL_FORMATS.get(decimal) or f"{{:.{decimal}f}}"
+    return fstr.format(number).rstrip("0").rstrip(".")
@@ -10,7 +10,7 @@ def read_index(filename):
     result = {}
 
     with open(filename) as input_file:
-        for line in input_file.readlines():
+        for line in input_file:
             (key, value) = line.split('|')
             result[key] = value.strip()
 
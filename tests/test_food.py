@@ -0,0 +1,77 @@
+import unittest
+
+from cronometer.datasource.userFoods import UserFood
+from cronometer.foods.food import Food
+from cronometer.foods.food import FoodNutrient
+from cronometer.foods.food import FoodSource
+from cronometer.foods.measure import GRAM
+from cronometer.foods.nutritionInfo import loadNutrientInfo
+
+
+def _makeFood(energy: float=100.0) -> Food:
+    return Food(name="Test Food",
+                uid=1,
+                comments=[],
+                measures=[GRAM],
+                nutrients=[FoodNutrient(name="Energy", amount=energy),
+                           FoodNutrient(name="Protein", amount=5.0)],
+                foodSource=FoodSource.LEGACY)
+
+
+def _makeUserFood() -> UserFood:
+    return UserFood(name="Test Food",
+                    uid="1",
+                    nutrients=[FoodNutrient(name="Energy", amount=100.0)])
+
+
+class FoodEqualityTest(unittest.TestCase):
+    """
+    The cached nutrient arrays must not break comparing foods.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.nutrientInfos = loadNutrientInfo()
+
+    def testEqualAfterNutrientArray(self):
+        a = _makeFood()
+        b = _makeFood()
+        a.nutrientDict(100)
+        b.nutrientDict(100)
+        a.nutrientArray(50, self.nutrientInfos)
+        b.nutrientArray(50, self.nutrientInfos)
+        self.assertEqual(a, b)
+        self.assertIn(a, [b])
+
+    def testEqualWhenOnlyOneIsCached(self):
+        a = _makeFood()
+        b = _makeFood()
+        a.nutrientArray(50, self.nutrientInfos)
+        self.assertEqual(a, b)
+
+    def testNotEqualAfterNutrientArray(self):
+        a = _makeFood()
+        b = _makeFood(energy=200.0)
+        a.nutrientArray(50, self.nutrientInfos)
+        b.nutrientArray(50, self.nutrientInfos)
+        self.assertNotEqual(a, b)
+
+    def testSetNutrientClearsArrays(self):
+        food = _makeFood()
+        self.assertEqual(food.nutrientDict(100)["Energy"], 100.0)
+        food.nutrientArray(100, self.nutrientInfos)
+        food.setNutrientByName("Energy", 150.0)
+        self.assertEqual(food.nutrientDict(100)["Energy"], 150.0)
+        idx = self.nutrientInfos.ordering().index("Energy")
+        self.assertEqual(food.nutrientArray(100, self.nutrientInfos)[idx],
+                         150.0)
+
+    def testUserFoodEqualAfterNutrientArray(self):
+        a = _makeUserFood()
+        b = _makeUserFood()
+        a.nutrientArray(50, self.nutrientInfos)
+        b.nutrientArray(50, self.nutrientInfos)
+        self.assertEqual(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
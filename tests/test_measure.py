@@ -0,0 +1,31 @@
+import unittest
+
+from pydantic import ValidationError
+
+from cronometer.foods.measure import GRAM
+from cronometer.foods.measure import Measure
+
+
+class MeasureTest(unittest.TestCase):
+    """
+    Measures are frozen so their cached display name can't go stale.
+    """
+    def testDisplayName(self):
+        m = Measure(grams=240.0, amount=1.5, description="cup")
+        self.assertEqual(m.displayName, "1.5 cup")
+        self.assertEqual(Measure(grams=30.0, amount=0.0,
+                                 description="slice").displayName,
+                         "slice")
+
+    def testFrozen(self):
+        m = Measure(grams=240.0, amount=1.5, description="cup")
+        m.displayName
+        with self.assertRaises(ValidationError):
+            m.amount = 2
+        with self.assertRaises(ValidationError):
+            GRAM.grams = 2.0
+        self.assertEqual(m.displayName, "1.5 cup")
+
+
+if __name__ == "__main__":
+    unittest.main()